@@ -0,0 +1,34 @@
+"""
+Shared pytest configuration for the Django AI Boost test suite.
+Django is set up once per session against the fixture test project, using a
+freshly migrated test database seeded by populate_db.py.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import django
+import pytest
+
+# Add fixtures/testproject to path
+fixtures_path = Path(__file__).parent / "fixtures" / "testproject"
+sys.path.insert(0, str(fixtures_path))
+
+# Set up Django settings to use the test project
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testproject.settings")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_setup():
+    """Set up Django and a seeded test database shared across all tests."""
+    django.setup()
+
+    from django.db import connection
+    from populate_db import populate
+
+    # Tests never touch the development db.sqlite3
+    old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+    populate()
+    yield
+    connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -17,6 +17,7 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = ["title", "author", "category", "status", "published_at", "view_count"]
+    list_select_related = ["author", "category"]
     list_filter = ["status", "category", "created_at"]
     search_fields = ["title", "content"]
     prepopulated_fields = {"slug": ["title"]}
@@ -27,6 +28,7 @@ class PostAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ["post", "author", "created_at", "is_approved"]
+    list_select_related = ["post", "author"]
     list_filter = ["is_approved", "created_at"]
     search_fields = ["content", "author__username"]
     raw_id_fields = ["post", "author"]
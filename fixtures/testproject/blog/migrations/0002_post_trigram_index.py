@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Trigram index backing the admin search_fields on Post.title and Post.content.
+# Django runs icontains as UPPER(column::text) LIKE UPPER(...) on PostgreSQL, so
+# the index is built on those expressions. It only exists on PostgreSQL, so it is
+# kept out of Post.Meta.indexes.
+#
+# The migration installs pg_trgm when it is missing. That needs superuser or,
+# since PostgreSQL 13, CREATE privilege on the database. Otherwise migrate fails
+# with a permission error until an administrator runs CREATE EXTENSION pg_trgm.
+CREATE_TRIGRAM_INDEX = (
+    "CREATE INDEX IF NOT EXISTS blog_post_title_content_trgm ON blog_post "
+    "USING gin (UPPER(title::text) gin_trgm_ops, UPPER(content::text) gin_trgm_ops)"
+)
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS blog_post_title_content_trgm"
+
+
+def add_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        installed = cursor.fetchone() is not None
+    if not installed:
+        schema_editor.execute("CREATE EXTENSION pg_trgm")
+    schema_editor.execute(CREATE_TRIGRAM_INDEX)
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_TRIGRAM_INDEX)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
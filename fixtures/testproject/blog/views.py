@@ -2,15 +2,68 @@
 Views for blog app.
 """
 
-from django.http import JsonResponse
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 
 from .models import Post
 
+# Prefer a C/Rust JSON encoder when one is installed. Every encoder hands
+# datetimes to DjangoJSONEncoder so they format the same way as JsonResponse.
+encode_default = DjangoJSONEncoder().default
+
+try:
+    import orjson
+
+    def dumps_json(data):
+        return orjson.dumps(
+            data, default=encode_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+except ImportError:
+    try:
+        import ujson
+
+        def dumps_json(data):
+            return ujson.dumps(data, default=encode_default).encode()
+
+    except ImportError:
+
+        def dumps_json(data):
+            return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def stream_json_list(key, rows):
+    """Yield a JSON object holding ``rows`` under ``key``, one row at a time."""
+    yield b'{"' + key.encode() + b'":['
+    first = True
+    for row in rows:
+        if not first:
+            yield b","
+        yield dumps_json(row)
+        first = False
+    yield b"]}"
+
 
 def post_list(request):
     """Display list of published posts."""
-    posts = Post.objects.filter(status="published").select_related("author", "category")
+    # Skip heavy columns such as content that the list never renders
+    posts = (
+        Post.objects.filter(status="published")
+        .select_related("author", "category")
+        .only(
+            "title",
+            "slug",
+            "excerpt",
+            "published_at",
+            "author__username",
+            "category__name",
+            "category__slug",
+        )
+    )
     return render(request, "blog/post_list.html", {"posts": posts})
 
 
@@ -21,9 +74,10 @@ def post_detail(request, pk):
         pk=pk,
         status="published",
     )
-    # Increment view count
+    # Increment view count atomically in the database
+    Post.objects.filter(pk=post.pk).update(view_count=F("view_count") + 1)
+    # Keep the rendered value in step without reloading the row
     post.view_count += 1
-    post.save(update_fields=["view_count"])
     return render(request, "blog/post_detail.html", {"post": post})
 
 
@@ -32,4 +86,7 @@ def api_post_list(request):
     posts = Post.objects.filter(status="published").values(
         "id", "title", "slug", "excerpt", "published_at"
     )
-    return JsonResponse({"posts": list(posts)})
+    return StreamingHttpResponse(
+        stream_json_list("posts", posts.iterator(chunk_size=500)),
+        content_type="application/json",
+    )
@@ -123,6 +123,22 @@ def populate():
         post3.tags.add(web_tag)
         print(f"Created post: {post3.title}")
 
+    # A post without tags or comments
+    post4, created = Post.objects.get_or_create(
+        slug="color-theory-basics",
+        defaults={
+            "title": "Color Theory Basics",
+            "author": user,
+            "category": design_category,
+            "content": "Understanding how colors work together is the foundation of good visual design. This post introduces the color wheel, contrast, and building a palette.",
+            "excerpt": "An introduction to color theory for designers.",
+            "status": "published",
+            "published_at": timezone.now(),
+        },
+    )
+    if created:
+        print(f"Created post: {post4.title}")
+
     # Create comments
     comment1, created = Comment.objects.get_or_create(
         post=post1,
@@ -3,12 +3,16 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from collections import defaultdict
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 import django
 from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
 from django.core.management import get_commands
 from django.db import connection
 from django.urls import get_resolver
@@ -290,20 +294,24 @@ async def list_migrations() -> list[dict[str, Any]]:
 
         loader = MigrationLoader(connection)
 
+        # Group migrations by app once instead of rescanning them for every app
+        migrations_by_app = defaultdict(list)
+        for app_label, migration_name in loader.disk_migrations:
+            migrations_by_app[app_label].append(migration_name)
+
         migrations_info = []
 
         for app_label in loader.migrated_apps:
             app_migrations = []
 
-            for migration_name in loader.disk_migrations:
-                if migration_name[0] == app_label:
-                    is_applied = migration_name in loader.applied_migrations
-                    app_migrations.append(
-                        {
-                            "name": migration_name[1],
-                            "applied": is_applied,
-                        }
-                    )
+            for migration_name in migrations_by_app[app_label]:
+                is_applied = (app_label, migration_name) in loader.applied_migrations
+                app_migrations.append(
+                    {
+                        "name": migration_name,
+                        "applied": is_applied,
+                    }
+                )
 
             if app_migrations:
                 migrations_info.append(
@@ -429,6 +437,100 @@ async def reverse_url(
         return {"error": f"Error reversing URL: {str(e)}"}
 
 
+# Field types whose database values are already JSON-friendly primitives
+_PRIMITIVE_FIELD_TYPES = frozenset(
+    {
+        "AutoField",
+        "BigAutoField",
+        "SmallAutoField",
+        "IntegerField",
+        "BigIntegerField",
+        "SmallIntegerField",
+        "PositiveIntegerField",
+        "PositiveBigIntegerField",
+        "PositiveSmallIntegerField",
+        "FloatField",
+        "BooleanField",
+        "CharField",
+        "TextField",
+        "SlugField",
+        "EmailField",
+        "URLField",
+        "FilePathField",
+        "GenericIPAddressField",
+    }
+)
+
+# Field types whose values are returned as strings (dates, times, decimals, ...)
+_STRING_FIELD_TYPES = frozenset(
+    {
+        "DateField",
+        "DateTimeField",
+        "TimeField",
+        "DurationField",
+        "DecimalField",
+        "UUIDField",
+    }
+)
+
+
+def _pass_value(value: Any) -> Any:
+    return value
+
+
+def _str_value(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # For dates, times, and other complex types
+    return str(value)
+
+
+def _value_encoder(field) -> Callable[[Any], Any]:
+    """Pick the function that turns a field's database value into a result value."""
+    # Fields with custom conversion may return anything, so check each value
+    if hasattr(field, "from_db_value"):
+        return _json_value
+
+    internal_type = field.get_internal_type()
+    if internal_type in _PRIMITIVE_FIELD_TYPES:
+        return _pass_value
+    if internal_type in _STRING_FIELD_TYPES:
+        return _str_value
+    return _json_value
+
+
+@lru_cache(maxsize=256)
+def _resolve_model(app_label: str, model_name: str):
+    """Look up a model class, caching the registry lookup."""
+    return apps.get_model(app_label, model_name)
+
+
+@lru_cache(maxsize=256)
+def _field_plan(
+    model,
+) -> tuple[tuple[tuple[str, Callable[[Any], Any]], ...], tuple[Any, ...]]:
+    """Split a model's concrete fields into (name, encoder) and (foreign key, key) pairs.
+
+    The key selects the related object's pk: the foreign key's own column, unless
+    it points at a to_field other than the pk, which needs a join.
+    """
+    scalar_fields = []
+    fk_fields = []
+    for field in model._meta.concrete_fields:
+        if field.is_relation:
+            value_key = (
+                field.attname if field.target_field.primary_key else f"{field.name}__pk"
+            )
+            fk_fields.append((field, value_key))
+        else:
+            scalar_fields.append((field.name, _value_encoder(field)))
+    return tuple(scalar_fields), tuple(fk_fields)
+
+
 @mcp.tool()
 async def query_model(
     app_label: str,
@@ -436,6 +538,9 @@ async def query_model(
     filters: dict[str, Any] | None = None,
     order_by: list[str] | None = None,
     limit: int = 100,
+    include: list[str] | None = None,
+    include_total: bool = False,
+    include_fk_repr: bool = False,
 ) -> dict[str, Any]:
     """
     Query a Django model with read-only operations using the Django ORM manager.
@@ -446,88 +551,169 @@ async def query_model(
         filters: Optional dictionary of field lookups (e.g., {"status": "published", "featured": true})
         order_by: Optional list of fields to order by (e.g., ["-created_at", "title"])
         limit: Maximum number of results to return (default: 100, max: 1000)
+        include: Optional list of many-to-many or reverse relations to include as lists of
+            related primary keys (e.g., ["tags", "comments"]); reverse one-to-one
+            relations are included as a single primary key or None
+        include_total: Whether to also run a COUNT query for the exact number of matches
+            (default: False; has_more tells whether results were cut off by the limit)
+        include_fk_repr: Whether to add a "<field>_str" string representation for each
+            foreign key (default: False)
 
     Returns:
         Dictionary containing query results or error message.
     """
 
+    # Resolve the model and build the queryset on the event loop. None of
+    # this touches the database, so invalid requests never hop to a thread.
+    try:
+        # Get the model
+        try:
+            model = _resolve_model(app_label, model_name)
+        except LookupError:
+            return {"error": f"Model '{app_label}.{model_name}' not found"}
+
+        # Enforce maximum limit for safety
+        max_limit = 1000
+        actual_limit = min(limit, max_limit) if limit else 100
+        if actual_limit < 1:
+            return {"error": f"Invalid limit: {limit} (must be a positive integer)"}
+
+        # Start with all objects
+        queryset = model.objects.all()
+
+        # Apply filters if provided
+        if filters:
+            try:
+                queryset = queryset.filter(**filters)
+            except Exception as e:
+                return {"error": f"Invalid filter parameters: {str(e)}"}
+
+        # Apply ordering if provided
+        if order_by:
+            try:
+                queryset = queryset.order_by(*order_by)
+            except Exception as e:
+                return {"error": f"Invalid order_by parameters: {str(e)}"}
+
+        # Validate the many-to-many and reverse relations to include
+        include_fields = []
+        for relation_name in include or []:
+            try:
+                field = model._meta.get_field(relation_name)
+            except FieldDoesNotExist as e:
+                return {"error": f"Invalid include parameters: {str(e)}"}
+            # Reverse one-to-one relations hold at most one related object
+            single = field.one_to_one and not field.concrete
+            if not (field.many_to_many or field.one_to_many or single):
+                return {
+                    "error": f"Invalid include parameters: '{relation_name}' is not "
+                    "a many-to-many or reverse relation"
+                }
+            include_fields.append((field.name, single))
+    except Exception as e:
+        return {"error": f"Error executing query: {str(e)}"}
+
     @sync_to_async
     def execute_query():
+        # Run every database query in a single thread hop
         try:
-            # Get the model
-            try:
-                model = apps.get_model(app_label, model_name)
-            except LookupError:
-                return {"error": f"Model '{app_label}.{model_name}' not found"}
-
-            # Enforce maximum limit for safety
-            max_limit = 1000
-            actual_limit = min(limit, max_limit) if limit else 100
-
-            # Start with all objects
-            queryset = model.objects.all()
-
-            # Apply filters if provided
-            if filters:
-                try:
-                    queryset = queryset.filter(**filters)
-                except Exception as e:
-                    return {"error": f"Invalid filter parameters: {str(e)}"}
-
-            # Apply ordering if provided
-            if order_by:
-                try:
-                    queryset = queryset.order_by(*order_by)
-                except Exception as e:
-                    return {"error": f"Invalid order_by parameters: {str(e)}"}
-
-            # Get total count before limiting
-            total_count = queryset.count()
-
-            # Limit results
-            queryset = queryset[:actual_limit]
-
-            # Convert queryset to list of dictionaries
-            results = []
-            for obj in queryset:
-                obj_dict = {}
-                for field in model._meta.get_fields():
-                    # Skip reverse relations
-                    if field.many_to_many or field.one_to_many:
-                        continue
-
-                    field_name = field.name
-                    try:
-                        value = getattr(obj, field_name)
-
-                        # Handle different field types
-                        if value is None:
-                            obj_dict[field_name] = None
-                        elif hasattr(field, "related_model") and field.related_model:
-                            # Foreign key - store the pk
-                            obj_dict[field_name] = value.pk if value else None
-                            obj_dict[f"{field_name}_str"] = (
-                                str(value) if value else None
-                            )
-                        elif isinstance(value, (str, int, float, bool)):
-                            obj_dict[field_name] = value
-                        else:
-                            # For dates, times, and other complex types
-                            obj_dict[field_name] = str(value)
-                    except Exception:
-                        # Skip fields that can't be accessed
-                        continue
+            # Only run the COUNT(*) query when the exact total is requested
+            total_count = queryset.count() if include_total else None
+
+            # Classify fields once per model instead of once per row
+            scalar_fields, fk_fields = _field_plan(model)
+
+            # Limit results and fetch plain dictionaries instead of model instances,
+            # reading one extra row to tell whether more results exist
+            rows = list(
+                queryset.values(
+                    *(field_name for field_name, _ in scalar_fields),
+                    *(value_key for _, value_key in fk_fields),
+                )[: actual_limit + 1]
+            )
+            has_more = len(rows) > actual_limit
+            del rows[actual_limit:]
+
+            # Look up related objects with one query per foreign key, only when
+            # their string representations are requested
+            fk_lookups = []
+            for field, value_key in fk_fields if include_fk_repr else ():
+                related_ids = {row[value_key] for row in rows}
+                related_ids.discard(None)
+                related_manager = field.related_model._base_manager
+                # Join the related model's own foreign keys, which __str__ often
+                # uses. This widens the one lookup query even when __str__ reads
+                # none of them, but a __str__ that does would otherwise run one
+                # query per related object.
+                related_fk_names = [
+                    related_field.name
+                    for related_field, _ in _field_plan(field.related_model)[1]
+                ]
+                related_objects = related_manager.select_related(
+                    *related_fk_names
+                ).in_bulk(related_ids)
+                fk_lookups.append((field.name, f"{field.name}_str", related_objects))
+
+            # Prefetch included relations with one query per relation, in batches
+            # that stay under the database's limit on query parameters
+            pk_attname = model._meta.pk.attname
+            row_pks = [row[pk_attname] for row in rows]
+            batch_size = connection.features.max_query_params or len(row_pks) or 1
+            include_lookups = []
+            for relation_name, single in include_fields:
+                related_pks = defaultdict(list)
+                for start in range(0, len(row_pks), batch_size):
+                    pairs = model._base_manager.filter(
+                        pk__in=row_pks[start : start + batch_size]
+                    ).values_list("pk", f"{relation_name}__pk")
+                    for pk, related_pk in pairs:
+                        if related_pk is not None:
+                            related_pks[pk].append(related_pk)
+                include_lookups.append((relation_name, single, related_pks))
+
+            # Convert rows to serializable dictionaries in place, re-encoding only
+            # the fields whose database values are not already JSON-friendly
+            encoded_fields = [
+                (field_name, encode)
+                for field_name, encode in scalar_fields
+                if encode is not _pass_value
+            ]
+            results = rows
+            for row in results:
+                row_pk = row[pk_attname]
+                for field_name, encode in encoded_fields:
+                    row[field_name] = encode(row[field_name])
+
+                for field, value_key in fk_fields:
+                    # Foreign key - store the related pk under the field name
+                    row[field.name] = row.pop(value_key)
+
+                for field_name, repr_key, related_objects in fk_lookups:
+                    related_pk = row[field_name]
+                    if related_pk is not None:
+                        related_obj = related_objects.get(related_pk)
+                        row[repr_key] = (
+                            str(related_obj) if related_obj is not None else None
+                        )
 
-                results.append(obj_dict)
+                for relation_name, single, related_pks in include_lookups:
+                    if single:
+                        row[relation_name] = (
+                            related_pks[row_pk][0] if row_pk in related_pks else None
+                        )
+                    else:
+                        row[relation_name] = related_pks.get(row_pk, [])
 
             return {
                 "app": app_label,
                 "model": model_name,
                 "total_count": total_count,
                 "returned_count": len(results),
+                "has_more": has_more,
                 "limit": actual_limit,
                 "filters": filters or {},
                 "order_by": order_by or [],
+                "include": include or [],
                 "results": results,
             }
 
@@ -1,140 +1,59 @@
 #!/usr/bin/env python
 """
-Test script for the query_model MCP tool.
-This script tests the new read-only query functionality by calling the implementation directly.
+Tests for the query_model MCP tool.
+These tests call the tool shipped in django_ai_boost.server_fastmcp directly.
+Run from project root: uv run pytest test_query_model.py
 """
 
-import asyncio
-import os
 import sys
 
-# Add the fixtures directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "fixtures", "testproject"))
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-# Set Django settings before importing
-os.environ["DJANGO_SETTINGS_MODULE"] = "testproject.settings"
+from django_ai_boost.server_fastmcp import query_model
 
-# Import Django and setup
-import django
-from asgiref.sync import sync_to_async
-from django.apps import apps
-
-django.setup()
-
-
-async def query_model_impl(
-    app_label: str,
-    model_name: str,
-    filters: dict | None = None,
-    order_by: list[str] | None = None,
-    limit: int = 100,
-) -> dict:
-    """Implementation of query_model tool for testing."""
-
-    @sync_to_async
-    def execute_query():
-        try:
-            # Get the model
-            try:
-                model = apps.get_model(app_label, model_name)
-            except LookupError:
-                return {"error": f"Model '{app_label}.{model_name}' not found"}
-
-            # Enforce maximum limit for safety
-            max_limit = 1000
-            actual_limit = min(limit, max_limit) if limit else 100
-
-            # Start with all objects
-            queryset = model.objects.all()
-
-            # Apply filters if provided
-            if filters:
-                try:
-                    queryset = queryset.filter(**filters)
-                except Exception as e:
-                    return {"error": f"Invalid filter parameters: {str(e)}"}
-
-            # Apply ordering if provided
-            if order_by:
-                try:
-                    queryset = queryset.order_by(*order_by)
-                except Exception as e:
-                    return {"error": f"Invalid order_by parameters: {str(e)}"}
-
-            # Get total count before limiting
-            total_count = queryset.count()
-
-            # Limit results
-            queryset = queryset[:actual_limit]
-
-            # Convert queryset to list of dictionaries
-            results = []
-            for obj in queryset:
-                obj_dict = {}
-                for field in model._meta.get_fields():
-                    # Skip reverse relations
-                    if field.many_to_many or field.one_to_many:
-                        continue
-
-                    field_name = field.name
-                    try:
-                        value = getattr(obj, field_name)
-
-                        # Handle different field types
-                        if value is None:
-                            obj_dict[field_name] = None
-                        elif hasattr(field, "related_model") and field.related_model:
-                            # Foreign key - store the pk
-                            obj_dict[field_name] = value.pk if value else None
-                            obj_dict[f"{field_name}_str"] = str(value) if value else None
-                        elif isinstance(value, (str, int, float, bool)):
-                            obj_dict[field_name] = value
-                        else:
-                            # For dates, times, and other complex types
-                            obj_dict[field_name] = str(value)
-                    except Exception:
-                        # Skip fields that can't be accessed
-                        continue
-
-                results.append(obj_dict)
-
-            return {
-                "app": app_label,
-                "model": model_name,
-                "total_count": total_count,
-                "returned_count": len(results),
-                "limit": actual_limit,
-                "filters": filters or {},
-                "order_by": order_by or [],
-                "results": results,
-            }
-
-        except Exception as e:
-            return {"error": f"Error executing query: {str(e)}"}
-
-    return await execute_query()
+
+async def capture_queries(coroutine):
+    """Await ``coroutine`` and return its result with the number of queries it ran.
+
+    The tool runs its queries on the sync_to_async thread, so the queries are
+    captured on that thread's connection.
+    """
+    context = CaptureQueriesContext(connection)
+    await sync_to_async(context.__enter__)()
+    try:
+        result = await coroutine
+    finally:
+        await sync_to_async(context.__exit__)(None, None, None)
+    return result, await sync_to_async(len)(context)
 
 
 async def test_query_model():
     """Test the query_model tool with various scenarios."""
+    from blog.models import Comment, Post
+
     print("=" * 80)
     print("Testing query_model MCP Tool")
     print("=" * 80)
 
     # Test 1: Query all posts (no filters)
     print("\n1. Query all posts (no filters):")
-    result = await query_model_impl(app_label="blog", model_name="Post")
-    print(f"   Total count: {result.get('total_count')}")
+    result = await query_model.fn(app_label="blog", model_name="Post")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         print(f"   First post: {result['results'][0].get('title')}")
 
     # Test 2: Query published posts only
     print("\n2. Query published posts only:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Post", filters={"status": "published"}
     )
-    print(f"   Total count: {result.get('total_count')}")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for post in result["results"]:
@@ -142,10 +61,11 @@ async def test_query_model():
 
     # Test 3: Query with ordering
     print("\n3. Query posts ordered by title:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Post", order_by=["title"], limit=5
     )
-    print(f"   Total count: {result.get('total_count')}")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for post in result["results"]:
@@ -153,10 +73,11 @@ async def test_query_model():
 
     # Test 4: Query featured posts
     print("\n4. Query featured posts:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Post", filters={"featured": True}
     )
-    print(f"   Total count: {result.get('total_count')}")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for post in result["results"]:
@@ -164,8 +85,9 @@ async def test_query_model():
 
     # Test 5: Query categories
     print("\n5. Query all categories:")
-    result = await query_model_impl(app_label="blog", model_name="Category")
-    print(f"   Total count: {result.get('total_count')}")
+    result = await query_model.fn(app_label="blog", model_name="Category")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for category in result["results"]:
@@ -173,17 +95,20 @@ async def test_query_model():
 
     # Test 6: Query with limit
     print("\n6. Query posts with limit=2:")
-    result = await query_model_impl(app_label="blog", model_name="Post", limit=2)
-    print(f"   Total count: {result.get('total_count')}")
+    result = await query_model.fn(app_label="blog", model_name="Post", limit=2)
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     print(f"   Limit applied: {result.get('limit')}")
+    assert result["returned_count"] <= 2
 
     # Test 7: Query comments
     print("\n7. Query approved comments:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Comment", filters={"is_approved": True}
     )
-    print(f"   Total count: {result.get('total_count')}")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for comment in result["results"]:
@@ -193,33 +118,123 @@ async def test_query_model():
 
     # Test 8: Invalid model (error handling)
     print("\n8. Test error handling with invalid model:")
-    result = await query_model_impl(app_label="blog", model_name="NonExistent")
-    if "error" in result:
-        print(f"   Expected error: {result['error']}")
+    result = await query_model.fn(app_label="blog", model_name="NonExistent")
+    assert "error" in result
+    print(f"   Expected error: {result['error']}")
 
     # Test 9: Invalid filter (error handling)
     print("\n9. Test error handling with invalid filter:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Post", filters={"invalid_field": "value"}
     )
-    if "error" in result:
-        print(f"   Expected error: {result['error']}")
+    assert "error" in result
+    print(f"   Expected error: {result['error']}")
 
     # Test 10: Query with descending order
     print("\n10. Query posts with descending order by created_at:")
-    result = await query_model_impl(
+    result = await query_model.fn(
         app_label="blog", model_name="Post", order_by=["-created_at"], limit=3
     )
-    print(f"   Total count: {result.get('total_count')}")
+    assert "error" not in result
+    print(f"   Has more: {result.get('has_more')}")
     print(f"   Returned count: {result.get('returned_count')}")
     if result.get("results"):
         for post in result["results"]:
             print(f"   - {post.get('title')} (created: {post.get('created_at')})")
 
+    # Test 11: Include many-to-many and reverse relations
+    print("\n11. Query posts including tags and comments:")
+    result, query_count = await capture_queries(
+        query_model.fn(
+            app_label="blog", model_name="Post", include=["tags", "comments"]
+        )
+    )
+    assert "error" not in result
+    # One query for the rows plus one per included relation
+    assert query_count == 1 + 2
+    expected = await sync_to_async(
+        lambda: {
+            post.pk: (
+                sorted(tag.pk for tag in post.tags.all()),
+                sorted(comment.pk for comment in post.comments.all()),
+            )
+            for post in Post.objects.prefetch_related("tags", "comments")
+        }
+    )()
+    for post in result["results"]:
+        assert isinstance(post["tags"], list)
+        assert isinstance(post["comments"], list)
+        assert (sorted(post["tags"]), sorted(post["comments"])) == expected[post["id"]]
+    assert any(post["tags"] == [] for post in result["results"])
+    print(f"   Has more: {result.get('has_more')}")
+    print(f"   Returned count: {result.get('returned_count')}")
+    if result.get("results"):
+        for post in result["results"]:
+            print(
+                f"   - {post.get('title')} (tags: {post.get('tags')}, "
+                f"comments: {post.get('comments')})"
+            )
+
+    # Test 12: Include a forward field (error handling)
+    print("\n12. Test error handling with invalid include:")
+    result = await query_model.fn(
+        app_label="blog", model_name="Post", include=["author"]
+    )
+    assert "error" in result
+    print(f"   Expected error: {result['error']}")
+
+    # Test 13: Query with limit and the exact total
+    print("\n13. Query posts with limit=2 and include_total=True:")
+    result = await query_model.fn(
+        app_label="blog", model_name="Post", limit=2, include_total=True
+    )
+    assert "error" not in result
+    assert result["has_more"] == (result["total_count"] > 2)
+    print(f"   Total count: {result.get('total_count')}")
+    print(f"   Returned count: {result.get('returned_count')}")
+    print(f"   Has more: {result.get('has_more')}")
+
+    # Test 14: Include foreign key string representations
+    print("\n14. Query comments with include_fk_repr=True:")
+    result, query_count = await capture_queries(
+        query_model.fn(app_label="blog", model_name="Comment", include_fk_repr=True)
+    )
+    assert "error" not in result
+    assert result["results"]
+    # One query for the rows plus one in_bulk() per foreign key (post, author)
+    assert query_count == 1 + 2
+    expected = await sync_to_async(
+        lambda: {
+            comment.pk: (str(comment.post), str(comment.author))
+            for comment in Comment.objects.select_related("post", "author")
+        }
+    )()
+    for comment in result["results"]:
+        assert (comment["post_str"], comment["author_str"]) == expected[comment["id"]]
+    print(f"   Returned count: {result.get('returned_count')}")
+    if result.get("results"):
+        for comment in result["results"]:
+            print(
+                f"   - Comment on {comment.get('post_str')!r} by {comment.get('author_str')}"
+            )
+
+    # Foreign key string representations are left out by default
+    result = await query_model.fn(app_label="blog", model_name="Comment")
+    assert "error" not in result
+    for comment in result["results"]:
+        assert "post_str" not in comment
+        assert "author_str" not in comment
+
+    # Test 15: Negative limit (error handling)
+    print("\n15. Test error handling with limit=-1:")
+    result = await query_model.fn(app_label="blog", model_name="Post", limit=-1)
+    assert "error" in result
+    print(f"   Expected error: {result['error']}")
+
     print("\n" + "=" * 80)
     print("All tests completed successfully!")
     print("=" * 80)
 
 
 if __name__ == "__main__":
-    asyncio.run(test_query_model())
+    sys.exit(pytest.main(["-s", __file__]))
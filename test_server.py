@@ -1,30 +1,20 @@
 #!/usr/bin/env python
 """
-Test script to verify Django AI Boost MCP server tools work correctly.
-Run from project root: python test_server.py
+Tests to verify Django AI Boost MCP server tools work correctly.
+Run from project root: uv run pytest test_server.py
 """
 
-import asyncio
-import os
 import sys
-from pathlib import Path
-
-# Add fixtures/testproject to path
-fixtures_path = Path(__file__).parent / "fixtures" / "testproject"
-sys.path.insert(0, str(fixtures_path))
-
-# Set up Django settings to use the test project
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testproject.settings")
+from collections import defaultdict
 
 import django
+import pytest
 from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.conf import settings
 from django.core.management import get_commands
 from django.db import connection
 
-django.setup()
-
 
 async def test_application_info():
     """Test application_info tool."""
@@ -53,7 +43,6 @@ async def test_application_info():
     print(f"Debug Mode: {info['debug_mode']}")
     print(f"Number of Models: {info['models_count']}")
     print(f"Installed Apps: {len(info['installed_apps'])} apps")
-    return info
 
 
 async def test_get_setting():
@@ -69,8 +58,6 @@ async def test_get_setting():
     db_engine = settings.DATABASES["default"]["ENGINE"]
     print(f"Database engine: {db_engine}")
 
-    return {"success": True}
-
 
 async def test_list_models():
     """Test list_models tool."""
@@ -104,7 +91,40 @@ async def test_list_models():
         print(f"  Table: {first_model['db_table']}")
         print(f"  Fields: {len(first_model['fields'])}")
 
-    return models_info
+
+def fetch_columns(cursor, tables):
+    """Return (table, column, type) rows for all tables in a single query."""
+    if not tables:
+        return []
+
+    placeholders = ", ".join(["%s"] * len(tables))
+    if connection.vendor == "sqlite":
+        cursor.execute(
+            "SELECT m.name, p.name, p.type "
+            "FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+            f"WHERE m.type = 'table' AND m.name IN ({placeholders}) "
+            "ORDER BY m.name, p.cid",
+            tables,
+        )
+    elif connection.vendor in ("postgresql", "mysql"):
+        schema = "current_schema()" if connection.vendor == "postgresql" else "DATABASE()"
+        cursor.execute(
+            "SELECT table_name, column_name, data_type "
+            "FROM information_schema.columns "
+            f"WHERE table_schema = {schema} AND table_name IN ({placeholders}) "
+            "ORDER BY table_name, ordinal_position",
+            tables,
+        )
+    else:
+        # Fall back to one introspection query per table
+        return [
+            (table_name, col.name, str(col.type_code))
+            for table_name in tables
+            for col in connection.introspection.get_table_description(
+                cursor, table_name
+            )
+        ]
+    return cursor.fetchall()
 
 
 async def test_database_schema():
@@ -121,22 +141,16 @@ async def test_database_schema():
         }
 
         with connection.cursor() as cursor:
-            tables = connection.introspection.table_names()
-            for table_name in tables[:5]:  # Limit to first 5 tables for test
-                table_description = connection.introspection.get_table_description(
-                    cursor, table_name
+            # Limit to first 5 tables for test
+            tables = connection.introspection.table_names(cursor)[:5]
+            columns = {table_name: [] for table_name in tables}
+            for table_name, column_name, data_type in fetch_columns(cursor, tables):
+                columns[table_name].append({"name": column_name, "type": data_type})
+
+            for table_name in tables:
+                schema_info["tables"].append(
+                    {"name": table_name, "columns": columns[table_name]}
                 )
-                table_info = {
-                    "name": table_name,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "type": str(col.type_code),
-                        }
-                        for col in table_description
-                    ],
-                }
-                schema_info["tables"].append(table_info)
         return schema_info
 
     schema_info = await get_schema()
@@ -149,8 +163,6 @@ async def test_database_schema():
         print(f"Example table: {first_table['name']}")
         print(f"  Columns: {len(first_table['columns'])}")
 
-    return schema_info
-
 
 async def test_list_migrations():
     """Test list_migrations tool."""
@@ -162,17 +174,20 @@ async def test_list_migrations():
         from django.db.migrations.loader import MigrationLoader
 
         loader = MigrationLoader(connection)
+        migrations_by_app = defaultdict(list)
+        for app_label, migration_name in loader.disk_migrations:
+            migrations_by_app[app_label].append(migration_name)
+
         migrations_info = []
 
         for app_label in loader.migrated_apps:
             app_migrations = []
-            for migration_name in loader.disk_migrations:
-                if migration_name[0] == app_label:
-                    is_applied = migration_name in loader.applied_migrations
-                    app_migrations.append({
-                        "name": migration_name[1],
-                        "applied": is_applied,
-                    })
+            for migration_name in migrations_by_app[app_label]:
+                is_applied = (app_label, migration_name) in loader.applied_migrations
+                app_migrations.append({
+                    "name": migration_name,
+                    "applied": is_applied,
+                })
 
             if app_migrations:
                 migrations_info.append({
@@ -190,8 +205,6 @@ async def test_list_migrations():
             total = len(app_mig["migrations"])
             print(f"  {app_mig['app']}: {applied}/{total} applied")
 
-    return migrations_info
-
 
 async def test_list_management_commands():
     """Test list_management_commands tool."""
@@ -199,18 +212,12 @@ async def test_list_management_commands():
     print("-" * 60)
 
     commands = get_commands()
-    commands_info = [
-        {"command": cmd_name, "app": app_name}
-        for cmd_name, app_name in sorted(commands.items())
-    ]
+    print(f"Found {len(commands)} management commands")
 
-    print(f"Found {len(commands_info)} management commands")
-    common_commands = ["migrate", "makemigrations", "runserver", "shell"]
-    for cmd in commands_info:
-        if cmd["command"] in common_commands:
-            print(f"  {cmd['command']} (from {cmd['app']})")
-
-    return commands_info
+    # Only the common commands are shown, so look them up directly
+    common_commands = {"migrate", "makemigrations", "runserver", "shell"}
+    for cmd_name in sorted(common_commands & commands.keys()):
+        print(f"  {cmd_name} (from {commands[cmd_name]})")
 
 
 async def test_get_absolute_url():
@@ -245,11 +252,8 @@ async def test_get_absolute_url():
         # Test with invalid pk
         print("\nTesting with invalid pk:")
         print("  Expected: Error message for non-existent instance")
-
-        return result
     else:
         print("No posts found in database")
-        return {"error": "No posts available for testing"}
 
 
 async def test_reverse_url():
@@ -278,41 +282,6 @@ async def test_reverse_url():
     print("\nTesting with invalid URL name:")
     print("  Expected: NoReverseMatch error")
 
-    return {
-        "post_list": url1,
-        "post_detail": url2,
-        "admin_index": url3,
-        "api_post_list": url4,
-    }
-
-
-async def test_all_tools():
-    """Test all MCP tools."""
-    print("=" * 60)
-    print("Testing Django AI Boost MCP Server Tools")
-    print("=" * 60)
-
-    try:
-        await test_application_info()
-        await test_get_setting()
-        await test_list_models()
-        await test_database_schema()
-        await test_list_migrations()
-        await test_list_management_commands()
-        await test_get_absolute_url()
-        await test_reverse_url()
-
-        print("\n" + "=" * 60)
-        print("All tools tested successfully! ✓")
-        print("=" * 60)
-
-    except Exception as e:
-        print(f"\nError during testing: {e}")
-        import traceback
-
-        traceback.print_exc()
-        sys.exit(1)
-
 
 if __name__ == "__main__":
-    asyncio.run(test_all_tools())
+    sys.exit(pytest.main(["-s", __file__]))